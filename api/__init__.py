@@ -1,3 +1,6 @@
+import importlib
+from typing import Any
+
 from .client import DigdagClient
 from .models import (
     Attempts,
@@ -14,7 +17,15 @@ from .models import (
     Sessions,
 )
 
+# The async client is re-exported lazily (PEP 562, same pattern as dig/__init__) so
+# that sync-only users never import httpx; it only needs to be installed by callers
+# that actually touch AsyncDigdagClient.
+_LAZY: dict[str, str] = {
+    "AsyncDigdagClient": ".async_client",
+}
+
 __all__ = [
+    "AsyncDigdagClient",
     "DigdagClient",
     "Attempts",
     "ProjectRevisions",
@@ -29,3 +40,16 @@ __all__ = [
     "Session",
     "Sessions",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY))
@@ -0,0 +1,397 @@
+import uuid
+import httpx
+from pydantic import BaseModel
+from typing import Any, TypeVar
+
+from ..dig.exporters import ProjectExporter
+from ..dig.models import WorkflowProject
+from .client import _build_path
+from .models import (
+    Attempts,
+    ProjectRevisions,
+    SessionAttempts,
+    WorkflowAttempt,
+    Workflows,
+    Workflow,
+    Attempt,
+    AttemptParameters,
+    Project,
+    Projects,
+    Session,
+    Sessions,
+)
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+class AsyncDigdagClient:
+    """
+    Async counterpart to DigdagClient built on httpx.AsyncClient.
+
+    The client is purely I/O bound, so exposing the same API as coroutines lets callers
+    fan out many independent requests with asyncio.gather() and pay roughly the latency
+    of the slowest call instead of the sum of all of them. The underlying httpx client
+    is long-lived and pools keep-alive connections, so repeated calls also avoid
+    per-request TCP/TLS setup.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        timeout: float | None = 30.0,
+    ) -> None:
+        # Same weak host normalization as the sync client. Assume the user provides the
+        # correct base url for their digdag instance, optionally already pointing to
+        # the /api path.
+        host = host.rstrip("/")
+        if not host.endswith("/api"):
+            host = host + "/api"
+
+        self.host: str = host
+        self._client = httpx.AsyncClient(
+            base_url=self.host,
+            limits=httpx.Limits(
+                max_keepalive_connections=20,
+                max_connections=100,
+            ),
+            timeout=timeout,
+            headers={
+                "Accept": "application/json",
+            },
+        )
+
+    async def aclose(self) -> None:
+        """
+        Close the underlying HTTP client and release any pooled connections.
+        """
+        await self._client.aclose()
+
+    async def __aenter__(self) -> "AsyncDigdagClient":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
+
+    def _parse(
+        self,
+        response: httpx.Response,
+        model: type[ModelT],
+    ) -> ModelT:
+        # Surface HTTP errors as such before parsing so an error body never gets fed
+        # through pydantic, then validate straight from the raw response bytes: the JSON
+        # is parsed and coerced in a single pass, skipping the intermediate dict that
+        # response.json() would build.
+        response.raise_for_status()
+        return model.model_validate_json(response.content)
+
+    def _make_path(
+        self,
+        *parts: str | int,
+    ) -> str:
+        # Digdag API paths are pretty predictable, so just shortcut their construction by
+        # joining a bunch of parts together. httpx resolves the path against base_url.
+        return _build_path(parts)
+
+    async def get_workflows(self) -> Workflows:
+        """
+        Retreive all workflows for all projects in the Digdag instance.
+        """
+        response = await self._client.get(
+            self._make_path(
+                "/workflows",
+            ),
+        )
+        return self._parse(response, Workflows)
+
+    async def get_workflow(
+        self,
+        id: str,
+    ) -> Workflow:
+        """
+        Retrieve an individual workflow by its ID.
+        """
+        response = await self._client.get(
+            self._make_path(
+                "/workflows",
+                id,
+            ),
+        )
+        return self._parse(response, Workflow)
+
+    async def get_sessions(self) -> Sessions:
+        """
+        Get all workflow sessions.
+        """
+        response = await self._client.get(
+            self._make_path(
+                "/sessions",
+            )
+        )
+        return self._parse(response, Sessions)
+
+    async def get_session(
+        self,
+        id: str,
+    ) -> Session:
+        """
+        Get an individual session by its ID.
+        """
+        response = await self._client.get(
+            self._make_path(
+                "/sessions",
+                id,
+            )
+        )
+        return self._parse(response, Session)
+
+    async def get_session_attempts(
+        self,
+        id: str,
+    ) -> SessionAttempts:
+        """
+        Retrieve all attempts run for a given session ID.
+        """
+        response = await self._client.get(
+            self._make_path(
+                "sessions",
+                id,
+                "attempts",
+            )
+        )
+        return self._parse(response, SessionAttempts)
+
+    async def get_attempts(
+        self,
+        project_name: str | None = None,
+        workflow_name: str | None = None,
+    ) -> Attempts:
+        """
+        Retrieve the last 100 attempts for all workflows for all projects.
+
+        Optionally filter by project and/or workflow name. The filtering happens server side
+        via query parameters, so narrow requests do not pay for the full attempt payload.
+        """
+        params = {}
+
+        if project_name is not None:
+            params["project"] = project_name
+
+        if workflow_name is not None:
+            params["workflow"] = workflow_name
+
+        response = await self._client.get(
+            self._make_path(
+                "/attempts",
+            ),
+            params=params,
+        )
+        return self._parse(response, Attempts)
+
+    async def get_attempt(
+        self,
+        id: str,
+    ) -> WorkflowAttempt:
+        """
+        Retrieve an attempt by its ID.
+        """
+        response = await self._client.get(
+            self._make_path(
+                "attempts",
+                id,
+            )
+        )
+        return self._parse(response, WorkflowAttempt)
+
+    async def start_attempt(
+        self,
+        parameters: AttemptParameters,
+    ) -> Attempt:
+        """
+        Start an attempt using an instance of AttemptParameters.
+        """
+        response = await self._client.put(
+            self._make_path("/attempts"),
+            headers={
+                "Content-Type": "application/json",
+            },
+            content=parameters.model_dump_json(
+                by_alias=True,
+            ),
+        )
+
+        if response.status_code != 200:
+            raise RuntimeError(
+                f"Digdag API returned an error status code ({response.status_code}).\n\n{response.text}"
+            )
+        return self._parse(response, Attempt)
+
+    async def _upload_project_archive(
+        self,
+        content: bytes,
+        project_name: str,
+        revision: str,
+        schedule_from: str | None = None,
+    ) -> Project:
+        # Build the params in one comprehension that drops unset values rather than
+        # branching per optional field.
+        params = {
+            k: v
+            for k, v in (
+                ("project", project_name),
+                ("revision", revision),
+                ("schedule_from", schedule_from),
+            )
+            if v is not None
+        }
+
+        response = await self._client.put(
+            self._make_path("/projects"),
+            headers={
+                "Content-Type": "application/gzip",
+            },
+            params=params,
+            content=content,
+        )
+
+        if response.status_code not in range(200, 300):
+            raise RuntimeError(response.text)
+
+        return self._parse(response, Project)
+
+    async def upload_project(
+        self,
+        project: WorkflowProject,
+        revision: str | None = None,
+        schedule_from: str | None = None,
+    ) -> Project:
+        """
+        Upload an entire Digdag project reference tagged to a specific revision. The project will be compiled
+        into a zip archive and uploaded to the Digdag host.
+
+        If a revision is not proided, a UUIDv4 value will be generated in its place.
+
+        Optionally, start scheduling workflows for the revision from a provided ISO8601 timestamp.
+        """
+        archiver = ProjectExporter()
+        revision = revision or str(uuid.uuid4())
+        tarball_content = archiver.export(project)
+        return await self._upload_project_archive(
+            tarball_content,
+            project.name,
+            revision,
+            schedule_from,
+        )
+
+    async def delete_project(
+        self,
+        id: str,
+    ) -> Project:
+        """
+        Delete a project by its ID. This only deletes the project archives and workflows but preserves
+        any session history.
+        """
+        response = await self._client.delete(
+            self._make_path(
+                "projects",
+                id,
+            ),
+        )
+        return self._parse(response, Project)
+
+    async def get_projects(
+        self,
+        name: str | None = None,
+    ) -> Projects:
+        """
+        Retrieve all projects.
+
+        Optionally, if a name is provided, retrieve specifically the project name requested. A collection is still
+        returned even when a name is provided.
+        """
+        params = {"name": name} if name is not None else None
+
+        response = await self._client.get(
+            self._make_path(
+                "/projects",
+            ),
+            params=params,
+        )
+        return self._parse(response, Projects)
+
+    async def get_project(
+        self,
+        id: str,
+    ) -> Project:
+        """
+        Retrieve an individual project by ID.
+        """
+        response = await self._client.get(
+            self._make_path(
+                "projects",
+                id,
+            ),
+        )
+        if response.status_code == 404:
+            raise ValueError(f"No matching project found for ID <{id}>")
+        return self._parse(response, Project)
+
+    async def get_project_by_name(
+        self,
+        name: str,
+    ) -> Project:
+        """
+        Retrieve a project by name.
+
+        This is a shortcut method that asks the server for just the matching project rather than
+        filtering the full collection client side.
+        """
+        projects = await self.get_projects(name=name)
+        return projects.filter_by_name(name)
+
+    async def get_project_workflows(
+        self,
+        id: str,
+    ) -> Workflows:
+        """
+        Retrieve all workflows for a project by project ID.
+        """
+        response = await self._client.get(
+            self._make_path(
+                "projects",
+                id,
+                "workflows",
+            ),
+        )
+        return self._parse(response, Workflows)
+
+    async def get_project_workflow_by_name(
+        self,
+        name: str,
+        workflow_name: str,
+    ) -> Workflow:
+        """
+        Retrieve a specific workflow from a project by project name and workflow name.
+        """
+        project = await self.get_project_by_name(name)
+        response = await self._client.get(
+            self._make_path(
+                "projects",
+                project.id,
+                "workflows",
+                workflow_name,
+            )
+        )
+        return self._parse(response, Workflow)
+
+    async def get_project_revisions(self, id: str) -> ProjectRevisions:
+        """
+        Retrieve all revisions of a project by project ID.
+        """
+        response = await self._client.get(
+            self._make_path(
+                "projects",
+                id,
+                "revisions",
+            )
+        )
+        return self._parse(response, ProjectRevisions)
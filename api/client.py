@@ -1,6 +1,19 @@
+import functools
+import os
 import uuid
 import requests
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from pydantic import BaseModel
+from requests.adapters import HTTPAdapter
+from typing import IO, Any, TypeVar
+from urllib3.util.retry import Retry
+
+# orjson serializes small payloads (the attempt-start body in particular) faster than
+# pydantic's JSON path. Use it when it happens to be installed, but never require it.
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from ..dig.exporters import ProjectExporter
 from ..dig.models import WorkflowProject
@@ -19,34 +32,146 @@ from .models import (
     Sessions,
 )
 
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+@functools.lru_cache(maxsize=1024)
+def _build_path(parts: tuple[str | int, ...]) -> str:
+    # The same handful of endpoint paths get rebuilt constantly in client loops, so the
+    # assembled string is cached per parts tuple. The host stays out of the key so the
+    # cache is shared across client instances.
+    return f"/{'/'.join(map(str, parts)).lstrip('/')}"
+
 
 class DigdagClient:
     def __init__(
         self,
         host: str,
+        timeout: float | None = 30.0,
     ) -> None:
         # Very weak check that the provided host is even remotely correct. Okay to assume that
         # the user provides the correct base url for their digdag instance, optionally already
         # pointing to the /api path.
-        if host.endswith("/"):
-            host = host.rstrip("/")
-
+        host = host.rstrip("/")
         if not host.endswith("/api"):
             host = host + "/api"
 
         self.host: str = host
+        self._timeout = timeout
+
+        # Reuse a single pooled session for the lifetime of the client so that consecutive
+        # API calls share keep-alive connections instead of paying a fresh TCP/TLS handshake
+        # per request. The pool is sized to keep up with _get_many fan-out without
+        # "connection pool is full" discards, and transient failures are retried with a
+        # small backoff. Retries are limited to idempotent read/delete methods: PUT bodies
+        # can be streamed from a file object here and are not replayable.
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=64,
+            max_retries=Retry(
+                total=5,
+                connect=5,
+                read=3,
+                backoff_factor=0.3,
+                status_forcelist=(429, 502, 503, 504),
+                allowed_methods=frozenset(["GET", "HEAD", "DELETE"]),
+            ),
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        # Every endpoint speaks JSON, so set the Accept header once on the session instead
+        # of rebuilding a headers dict per call.
+        self._session.headers["Accept"] = "application/json"
+
+        # Conditional-GET cache keyed by (url, params). When the server tags a response
+        # with an ETag, repeat GETs revalidate with If-None-Match and a 304 answer reuses
+        # the cached response without shipping the body again. This helps the by-name
+        # shortcut methods that hit the same collection endpoints over and over.
+        self._etag_cache: dict[Any, tuple[str, requests.Response]] = {}
+
+    def close(self) -> None:
+        """
+        Close the underlying HTTP session and release any pooled connections.
+        """
+        self._session.close()
+
+    def __enter__(self) -> "DigdagClient":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
 
     def _make_url(
         self,
         *parts: str | int,
     ) -> str:
-        # Digdag API paths are pretty predictable, so just shortcut their construction by joining
-        # a bunch of parts, either str/int, together by a back slash.
-        full_path = "/".join([str(item).lstrip("/") for item in parts])
-        if not full_path.startswith("/"):
-            full_path = "/" + full_path
+        # Digdag API paths are pretty predictable, so just shortcut their construction by
+        # joining a bunch of parts, either str/int, onto the precomputed base. This is the
+        # generic fallback; the fixed endpoint shapes below build their URLs as single
+        # f-strings instead.
+        return self.host + _build_path(parts)
 
-        return self.host + full_path
+    def _workflows_url(self, id: str | None = None) -> str:
+        if id is None:
+            return f"{self.host}/workflows"
+        return f"{self.host}/workflows/{id}"
+
+    def _sessions_url(self, id: str | None = None) -> str:
+        if id is None:
+            return f"{self.host}/sessions"
+        return f"{self.host}/sessions/{id}"
+
+    def _session_attempts_url(self, id: str) -> str:
+        return f"{self.host}/sessions/{id}/attempts"
+
+    def _attempts_url(self, id: str | None = None) -> str:
+        if id is None:
+            return f"{self.host}/attempts"
+        return f"{self.host}/attempts/{id}"
+
+    def _projects_url(self, id: str | None = None) -> str:
+        if id is None:
+            return f"{self.host}/projects"
+        return f"{self.host}/projects/{id}"
+
+    def _project_workflows_url(self, id: str) -> str:
+        return f"{self.host}/projects/{id}/workflows"
+
+    def _project_workflow_url(self, id: str, workflow_name: str) -> str:
+        return f"{self.host}/projects/{id}/workflows/{workflow_name}"
+
+    def _project_revisions_url(self, id: str) -> str:
+        return f"{self.host}/projects/{id}/revisions"
+
+    def _parse(
+        self,
+        response: requests.Response,
+        model: type[ModelT],
+    ) -> ModelT:
+        # Surface HTTP errors as such before parsing so an error body never gets fed
+        # through pydantic, then validate straight from the raw response bytes: the JSON
+        # is parsed and coerced in a single pass, skipping the intermediate dict that
+        # response.json() would build.
+        response.raise_for_status()
+        return model.model_validate_json(response.content)
+
+    def _request(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, Any] | None = None,
+        params: dict[str, Any] | None = None,
+        data: Any = None,
+    ) -> requests.Response:
+        return self._session.request(
+            method,
+            url,
+            headers=headers,
+            params=params,
+            data=data,
+            timeout=self._timeout,
+        )
 
     def _get(
         self,
@@ -54,19 +179,57 @@ class DigdagClient:
         headers: dict[str, Any] | None = None,
         params: dict[str, Any] | None = None,
     ) -> requests.Response:
-        return requests.get(
+        cache_key = (url, tuple(sorted(params.items())) if params else None)
+        cached = self._etag_cache.get(cache_key)
+        if cached is not None:
+            headers = dict(headers) if headers else {}
+            headers["If-None-Match"] = cached[0]
+
+        response = self._request(
+            "GET",
             url,
             headers=headers,
             params=params,
         )
 
+        if response.status_code == 304 and cached is not None:
+            return cached[1]
+
+        etag = response.headers.get("ETag")
+        if etag is not None and response.status_code == 200:
+            self._etag_cache[cache_key] = (etag, response)
+
+        return response
+
+    def _get_model(
+        self,
+        model: type[ModelT],
+        url: str,
+        params: dict[str, Any] | None = None,
+    ) -> ModelT:
+        # Nearly every getter is "GET this url, parse the body into that model", so the
+        # pairing lives in one place instead of being repeated per endpoint.
+        return self._parse(self._get(url, params=params), model)
+
+    def _get_many(
+        self,
+        urls: list[str],
+        max_workers: int = 16,
+    ) -> list[requests.Response]:
+        # Fan independent GETs out over a thread pool sharing the pooled session so that
+        # N requests cost roughly the latency of the slowest one instead of the sum.
+        # Responses come back in the same order as the provided urls.
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self._get, urls))
+
     def _delete(
         self,
         url: str,
         headers: dict[str, Any] | None = None,
         params: dict[str, Any] | None = None,
     ) -> requests.Response:
-        return requests.delete(
+        return self._request(
+            "DELETE",
             url,
             headers=headers,
             params=params,
@@ -79,7 +242,8 @@ class DigdagClient:
         params: dict[str, Any] | None = None,
         data: Any = None,
     ) -> requests.Response:
-        return requests.post(
+        return self._request(
+            "POST",
             url,
             headers=headers,
             params=params,
@@ -93,7 +257,8 @@ class DigdagClient:
         params: dict[str, Any] | None = None,
         data: Any = None,
     ) -> requests.Response:
-        return requests.put(
+        return self._request(
+            "PUT",
             url,
             headers=headers,
             params=params,
@@ -106,12 +271,7 @@ class DigdagClient:
         """
         Retreive all workflows for all projects in the Digdag instance.
         """
-        response = self._get(
-            self._make_url(
-                "/workflows",
-            ),
-        )
-        return Workflows.model_validate(response.json())
+        return self._get_model(Workflows, self._workflows_url())
 
     def get_workflow(
         self,
@@ -120,24 +280,13 @@ class DigdagClient:
         """
         Retrieve an individual workflow by its ID.
         """
-        response = self._get(
-            self._make_url(
-                "/workflows",
-                id,
-            ),
-        )
-        return Workflow.model_validate(response.json())
+        return self._get_model(Workflow, self._workflows_url(id))
 
     def get_sessions(self) -> Sessions:
         """
         Get all workflow sessions.
         """
-        response = self._get(
-            self._make_url(
-                "/sessions",
-            )
-        )
-        return Sessions.model_validate(response.json())
+        return self._get_model(Sessions, self._sessions_url())
 
     def get_session(
         self,
@@ -146,13 +295,7 @@ class DigdagClient:
         """
         Get an individual session by its ID.
         """
-        response = self._get(
-            self._make_url(
-                "/sessions",
-                id,
-            )
-        )
-        return Session.model_validate(response.json())
+        return self._get_model(Session, self._sessions_url(id))
 
     def get_session_attempts(
         self,
@@ -161,25 +304,28 @@ class DigdagClient:
         """
         Retrieve all attempts run for a given session ID.
         """
-        response = self._get(
-            self._make_url(
-                "sessions",
-                id,
-                "attempts",
-            )
-        )
-        return SessionAttempts.model_validate(response.json())
+        return self._get_model(SessionAttempts, self._session_attempts_url(id))
 
-    def get_attempts(self) -> Attempts:
+    def get_attempts(
+        self,
+        project_name: str | None = None,
+        workflow_name: str | None = None,
+    ) -> Attempts:
         """
         Retrieve the last 100 attempts for all workflows for all projects.
+
+        Optionally filter by project and/or workflow name. The filtering happens server side
+        via query parameters, so narrow requests do not pay for the full attempt payload.
         """
-        response = self._get(
-            self._make_url(
-                "/attempts",
-            )
-        )
-        return Attempts.model_validate(response.json())
+        params = {}
+
+        if project_name is not None:
+            params["project"] = project_name
+
+        if workflow_name is not None:
+            params["workflow"] = workflow_name
+
+        return self._get_model(Attempts, self._attempts_url(), params=params)
 
     def get_attempt(
         self,
@@ -188,13 +334,7 @@ class DigdagClient:
         """
         Retrieve an attempt by its ID.
         """
-        response = self._get(
-            self._make_url(
-                "attempts",
-                id,
-            )
-        )
-        return WorkflowAttempt.model_validate(response.json())
+        return self._get_model(WorkflowAttempt, self._attempts_url(id))
 
     def start_attempt(
         self,
@@ -203,50 +343,78 @@ class DigdagClient:
         """
         Start an attempt using an instance of AttemptParameters.
         """
+        if orjson is not None:
+            payload: bytes | str = orjson.dumps(
+                parameters.model_dump(
+                    by_alias=True,
+                    mode="json",
+                )
+            )
+        else:
+            payload = parameters.model_dump_json(
+                by_alias=True,
+            )
+
         response = self._put(
-            self._make_url("/attempts"),
+            self._attempts_url(),
             headers={
                 "Content-Type": "application/json",
             },
-            data=parameters.model_dump_json(
-                by_alias=True,
-            ),
+            data=payload,
         )
 
         if response.status_code != 200:
             raise RuntimeError(
                 f"Digdag API returned an error status code ({response.status_code}).\n\n{response.text}"
             )
-        return Attempt.model_validate(response.json())
+        return self._parse(response, Attempt)
 
     def _upload_project_archive(
         self,
-        content: bytes,
+        content: bytes | IO[bytes],
         project_name: str,
         revision: str,
         schedule_from: str | None = None,
     ) -> Project:
+        # Build the params in one comprehension that drops unset values rather than
+        # branching per optional field.
         params = {
-            "project": project_name,
-            "revision": revision,
+            k: v
+            for k, v in (
+                ("project", project_name),
+                ("revision", revision),
+                ("schedule_from", schedule_from),
+            )
+            if v is not None
         }
 
-        if schedule_from is not None:
-            params["schedule_from"] = schedule_from
+        headers: dict[str, Any] = {
+            "Content-Type": "application/gzip",
+        }
 
-        response = self._put(
-            self._make_url("/projects"),
-            headers={
-                "Content-Type": "application/gzip",
-            },
-            params=params,
-            data=content,
-        )
+        # When given an open file object, let requests stream it out in chunks rather
+        # than buffering the archive as one bytes blob. An explicit Content-Length keeps
+        # the transfer un-chunked, which some proxies in front of Digdag prefer.
+        if not isinstance(content, bytes):
+            content.seek(0, os.SEEK_END)
+            headers["Content-Length"] = str(content.tell())
+            content.seek(0)
+
+        try:
+            response = self._put(
+                self._projects_url(),
+                headers=headers,
+                params=params,
+                data=content,
+            )
+        finally:
+            if not isinstance(content, bytes):
+                content.close()
 
         if response.status_code not in range(200, 300):
             raise RuntimeError(response.text)
 
-        return Project.model_validate(response.json())
+        return self._parse(response, Project)
 
     def upload_project(
         self,
@@ -264,9 +432,9 @@ class DigdagClient:
         """
         archiver = ProjectExporter()
         revision = revision or str(uuid.uuid4())
-        tarball_content = archiver.export(project)
+        tarball_stream = archiver.export_stream(project)
         return self._upload_project_archive(
-            tarball_content,
+            tarball_stream,
             project.name,
             revision,
             schedule_from,
@@ -280,13 +448,8 @@ class DigdagClient:
         Delete a project by its ID. This only deletes the project archives and workflows but preserves
         any session history.
         """
-        response = self._delete(
-            self._make_url(
-                "projects",
-                id,
-            ),
-        )
-        return Project.model_validate(response.json())
+        response = self._delete(self._projects_url(id))
+        return self._parse(response, Project)
 
     def get_projects(
         self,
@@ -298,18 +461,9 @@ class DigdagClient:
         Optionally, if a name is provided, retrieve specifically the project name requested. A collection is still
         returned even when a name is provided.
         """
-        params = {}
+        params = {"name": name} if name is not None else None
 
-        if name is not None:
-            params["name"] = name
-
-        response = self._get(
-            self._make_url(
-                "/projects",
-            ),
-            params=params,
-        )
-        return Projects.model_validate(response.json())
+        return self._get_model(Projects, self._projects_url(), params=params)
 
     def get_project(
         self,
@@ -318,15 +472,10 @@ class DigdagClient:
         """
         Retrieve an individual project by ID.
         """
-        response = self._get(
-            self._make_url(
-                "projects",
-                id,
-            ),
-        )
+        response = self._get(self._projects_url(id))
         if response.status_code == 404:
             raise ValueError(f"No matching project found for ID <{id}>")
-        return Project.model_validate(response.json())
+        return self._parse(response, Project)
 
     def get_project_by_name(
         self,
@@ -335,9 +484,10 @@ class DigdagClient:
         """
         Retrieve a project by name.
 
-        This is a shortcut method that calls the full colllection of projects and filters by the provided name.
+        This is a shortcut method that asks the server for just the matching project rather than
+        filtering the full collection client side.
         """
-        return self.get_projects().filter_by_name(name)
+        return self.get_projects(name=name).filter_by_name(name)
 
     def get_project_workflows(
         self,
@@ -346,14 +496,7 @@ class DigdagClient:
         """
         Retrieve all workflows for a project by project ID.
         """
-        response = self._get(
-            self._make_url(
-                "projects",
-                id,
-                "workflows",
-            ),
-        )
-        return Workflows.model_validate(response.json())
+        return self._get_model(Workflows, self._project_workflows_url(id))
 
     def get_project_workflow_by_name(
         self,
@@ -364,25 +507,32 @@ class DigdagClient:
         Retrieve a specific workflow from a project by project name and workflow name.
         """
         project = self.get_project_by_name(name)
-        response = self._get(
-            self._make_url(
-                "projects",
-                project.id,
-                "workflows",
-                workflow_name,
-            )
+        return self._get_model(Workflow, self._project_workflow_url(project.id, workflow_name))
+
+    def get_project_workflows_by_names(
+        self,
+        name: str,
+        workflow_names: list[str],
+    ) -> list[Workflow]:
+        """
+        Retrieve several workflows from a project by project name and workflow names.
+
+        The project is resolved once and the per-workflow requests are issued concurrently
+        over the pooled session, so fetching N workflows costs roughly one round-trip plus
+        the slowest lookup instead of N sequential round-trips. Results come back in the
+        same order as the provided names.
+        """
+        project = self.get_project_by_name(name)
+        responses = self._get_many(
+            [
+                self._project_workflow_url(project.id, workflow_name)
+                for workflow_name in workflow_names
+            ]
         )
-        return Workflow.model_validate(response.json())
+        return [self._parse(response, Workflow) for response in responses]
 
     def get_project_revisions(self, id: str) -> ProjectRevisions:
         """
         Retrieve all revisions of a project by project ID.
         """
-        response = self._get(
-            self._make_url(
-                "projects",
-                id,
-                "revisions",
-            )
-        )
-        return ProjectRevisions.model_validate(response.json())
+        return self._get_model(ProjectRevisions, self._project_revisions_url(id))
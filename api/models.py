@@ -1,11 +1,16 @@
 from uuid import UUID
-from pydantic import BaseModel, Field, ConfigDict
-from typing import Any, Generator, Iterator
+from pydantic import BaseModel, Field, ConfigDict, PlainSerializer, PrivateAttr
+from typing import Annotated, Any, Callable, Iterator
 from datetime import datetime, UTC
 
 
 class AttemptParameters(BaseModel):
-    session_time: datetime = Field(
+    # The only producer is create_attempt_parameters below, which always supplies a real
+    # datetime, so serialization just needs a plain isoformat rather than any coercion.
+    session_time: Annotated[
+        datetime,
+        PlainSerializer(lambda d: d.isoformat(), return_type=str),
+    ] = Field(
         alias="sessionTime",
     )
     workflow_id: str = Field(
@@ -41,12 +46,12 @@ class WorkflowReference(BaseModel):
         if params is None:
             params = {}
 
-        return AttemptParameters.model_validate(
-            {
-                "session_time": session_time,
-                "workflow_id": self.id,
-                "params": params,
-            }
+        # Every value here is already well typed, so skip the validation pass that
+        # model_validate would run per attempt.
+        return AttemptParameters.model_construct(
+            session_time=session_time,
+            workflow_id=self.id,
+            params=params,
         )
 
 
@@ -106,39 +111,71 @@ class Attempts(BaseModel):
 class Workflows(BaseModel):
     workflows: list[Workflow]
 
-    def __iter__(self) -> Generator[Workflow, None, None]:
-        for workflow in self.workflows:
-            yield workflow
+    # Lazily built lookup dicts backing the filter_by_* methods. Responses are treated as
+    # read-only once parsed, so each index is computed on first use and reused for every
+    # subsequent lookup instead of re-scanning the list per call.
+    _indexes: dict[str, dict[str, Workflow]] = PrivateAttr(default_factory=dict)
+
+    def __iter__(self) -> Iterator[Workflow]:
+        # Hand back the list's native iterator rather than a generator frame per loop.
+        return iter(self.workflows)
+
+    def _index(
+        self,
+        key: str,
+        key_fn: Callable[[Workflow], str],
+    ) -> dict[str, Workflow]:
+        index = self._indexes.get(key)
+        if index is None:
+            index = {}
+            # setdefault keeps the first match, matching the previous linear-scan behavior
+            # when several workflows share the same key.
+            for item in self.workflows:
+                index.setdefault(key_fn(item), item)
+            self._indexes[key] = index
+        return index
 
     def filter_by_project_name(self, name: str) -> Workflow:
-        for item in self.workflows:
-            if item.project.name == name:
-                return item
-        raise RuntimeError("No workflow found for project name: %s" % name)
+        item = self._index("project_name", lambda w: w.project.name).get(name)
+        if item is None:
+            raise RuntimeError("No workflow found for project name: %s" % name)
+        return item
 
     def filter_by_project_id(self, id: str) -> Workflow:
-        for item in self.workflows:
-            if item.project.id == id:
-                return item
-        raise RuntimeError("No workflow found for project id: %s" % id)
+        item = self._index("project_id", lambda w: w.project.id).get(id)
+        if item is None:
+            raise RuntimeError("No workflow found for project id: %s" % id)
+        return item
 
     def filter_by_id(self, id: str) -> Workflow:
-        for item in self.workflows:
-            if item.id == id:
-                return item
-        raise RuntimeError("No workflow found for id: %s" % id)
+        item = self._index("id", lambda w: w.id).get(id)
+        if item is None:
+            raise RuntimeError("No workflow found for id: %s" % id)
+        return item
 
     def filter_by_name(self, name: str) -> Workflow:
-        for item in self.workflows:
-            if item.name == name:
-                return item
-        raise RuntimeError("No workflow found for name: %s" % name)
+        item = self._index("name", lambda w: w.name).get(name)
+        if item is None:
+            raise RuntimeError("No workflow found for name: %s" % name)
+        return item
 
     def filter_by_revision(self, revision: str) -> Workflow:
-        for item in self.workflows:
-            if item.revision == revision:
-                return item
-        raise RuntimeError("No workflow found for revision: %s" % revision)
+        item = self._index("revision", lambda w: w.revision).get(revision)
+        if item is None:
+            raise RuntimeError("No workflow found for revision: %s" % revision)
+        return item
+
+    def filter(self, predicate: Callable[[Workflow], bool]) -> "Workflows":
+        """
+        Return a new collection containing only the workflows matching the predicate.
+
+        The elements were already validated when the collection was parsed from the API
+        response, so the filtered collection is built with model_construct to skip
+        re-running validation over them.
+        """
+        return Workflows.model_construct(
+            workflows=[item for item in self.workflows if predicate(item)],
+        )
 
 
 class ProjectRevision(BaseModel):
@@ -186,16 +223,35 @@ class Project(ProjectReference):
 class Projects(BaseModel):
     projects: list[Project]
 
+    # Same lazily built index scheme as Workflows; see the comment there.
+    _name_index: dict[str, Project] | None = PrivateAttr(default=None)
+
     def __iter__(self) -> Iterator[Project]:
-        for project in self.projects:
-            yield project
+        return iter(self.projects)
 
     def filter_by_name(self, name: str) -> Project:
-        for project in self.projects:
-            if project.name == name:
-                return project
-
-        raise RuntimeError("No project found for name: %s" % name)
+        if self._name_index is None:
+            index: dict[str, Project] = {}
+            for project in self.projects:
+                index.setdefault(project.name, project)
+            self._name_index = index
+
+        project = self._name_index.get(name)
+        if project is None:
+            raise RuntimeError("No project found for name: %s" % name)
+        return project
+
+    def filter(self, predicate: Callable[[Project], bool]) -> "Projects":
+        """
+        Return a new collection containing only the projects matching the predicate.
+
+        The elements were already validated when the collection was parsed from the API
+        response, so the filtered collection is built with model_construct to skip
+        re-running validation over them.
+        """
+        return Projects.model_construct(
+            projects=[project for project in self.projects if predicate(project)],
+        )
 
 
 class Session(BaseModel):
@@ -1,21 +1,28 @@
-from .exporters import WorkflowExporter, ProjectExporter
-from .models import (
-    ErrorTask,
-    NamedTask,
-    CommandTask,
-    EmbeddedTask,
-    ParallelTask,
-    RepeatableTask,
-    IntervalRetryCondition,
-    SimpleRetryCondition,
-    Workflow,
-    DependentWorkflow,
-    WorkflowProject,
-    DockerBuildImageTask,
-    DockerImage,
-    DockerImageConfiguration,
-    DockerVolume,
-)
+import importlib
+from typing import Any
+
+# Import the public names lazily (PEP 562) so that API-only users do not pay for
+# pulling in the exporters (and the tarfile/gzip machinery behind them) or the model
+# module at import time; each submodule loads on first attribute access.
+_LAZY: dict[str, str] = {
+    "WorkflowExporter": ".exporters",
+    "ProjectExporter": ".exporters",
+    "ErrorTask": ".models",
+    "NamedTask": ".models",
+    "CommandTask": ".models",
+    "EmbeddedTask": ".models",
+    "ParallelTask": ".models",
+    "RepeatableTask": ".models",
+    "IntervalRetryCondition": ".models",
+    "SimpleRetryCondition": ".models",
+    "Workflow": ".models",
+    "DependentWorkflow": ".models",
+    "WorkflowProject": ".models",
+    "DockerBuildImageTask": ".models",
+    "DockerImage": ".models",
+    "DockerImageConfiguration": ".models",
+    "DockerVolume": ".models",
+}
 
 __all__ = [
     "WorkflowExporter",
@@ -36,3 +43,17 @@ __all__ = [
     "DockerImageConfiguration",
     "DockerVolume",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    # Cache on the package so subsequent lookups skip __getattr__ entirely.
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY))
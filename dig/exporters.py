@@ -1,9 +1,22 @@
+import fnmatch
+import gzip
+import io
 import pathlib
-import shutil
 import tempfile
 import tarfile
+import time
 
-from io import StringIO, TextIOWrapper
+from collections import ChainMap
+
+from typing import IO, Callable, Iterable
+
+# ISA-L provides a SIMD-accelerated deflate that is typically several times faster than
+# stdlib zlib. Use it for the archive gzip stream when it happens to be installed, but
+# never require it.
+try:
+    from isal import igzip
+except ImportError:
+    igzip = None
 
 from .models import (
     ErrorTask,
@@ -23,13 +36,21 @@ from .models import (
 )
 
 
+# Indentation strings keyed by nesting level, computed once at import. The exporter asks
+# for indents several times per task, so this avoids re-multiplying the same string for
+# every task in every workflow. Workflows nested deeper than this fall back to multiplying.
+_INDENTS: tuple[str, ...] = tuple("    " * level for level in range(64))
+
+
 class WorkflowExporter:
     def _get_indent_width(self, level: int) -> str:
+        if level < len(_INDENTS):
+            return _INDENTS[level]
         return "    " * level
 
     def _export_task_content(
         self,
-        f: TextIOWrapper,
+        emit: Callable[[str], None],
         task: NamedTask,
         indent_level: int,
         exports: dict[str, YamlSupportedType] | None = None,
@@ -42,179 +63,231 @@ class WorkflowExporter:
         sub_sub_item_indent: str = self._get_indent_width(indent_level + 2)
 
         if isinstance(task, ErrorTask):
-            f.write("_error:\n")
+            emit("_error:\n")
         else:
-            f.write(task_indent + f"+{task.name}:\n")
+            emit(f"{task_indent}+{task.name}:\n")
 
         # Exports are optional. Locally scoped exports take precedence over the higher
-        # scoped ones ex. Workflow level exports.
+        # scoped ones ex. Workflow level exports. The key/value lines are joined into one
+        # fragment so the whole block costs a single emit instead of one per entry.
         if task.exports is not None:
-            f.write(sub_item_indent + "_export:\n")
-            for k, v in task.exports.items():
-                f.write(sub_sub_item_indent + f"{k}: {v}\n")
-            f.write("\n")
+            emit(f"{sub_item_indent}_export:\n")
+            emit(
+                "".join(
+                    f"{sub_sub_item_indent}{k}: {v}\n" for k, v in task.exports.items()
+                )
+            )
+            emit("\n")
 
         if task.retry_condition is not None:
             if isinstance(task.retry_condition, IntervalRetryCondition):
-                f.write(sub_item_indent + "_retry: \n")
-                f.write(sub_sub_item_indent + f"limit: {task.retry_condition.limit}")
-                f.write(
+                emit(sub_item_indent + "_retry: \n")
+                emit(sub_sub_item_indent + f"limit: {task.retry_condition.limit}")
+                emit(
                     sub_sub_item_indent + f"interval: {task.retry_condition.interval}"
                 )
-                f.write(
+                emit(
                     sub_sub_item_indent
                     + f"interval_type: {task.retry_condition.interval_type.value}"
                 )
             elif isinstance(task.retry_condition, SimpleRetryCondition):
-                f.write(sub_item_indent + f"_retry: {task.retry_condition.limit}")
-
-            f.write("\n")
-
-        if isinstance(task, ParallelTask):
-            # Parallel tasks have a short hand notation for the parallel flag when no other
-            # configuration properties are provided. Opt to just set the option to 'true' when
-            # no limit is provided.
-
-            # Additionally, the full configuration object is required to even instantiate a ParallelTask
-            # so we can first make the assumption that the intent is for the Task to run in parallel and that
-            # if a limit is not provided, then the tasks should ALL run in parallel.
-            if task.configuration.limit is not None:
-                f.write(sub_item_indent + "_parallel:\n")
-                f.write(sub_sub_item_indent + f"limit: {task.configuration.limit}")
-            # Although the parallel flag really should just be True, optionally, allow the value to be false
-            # as a quick shorthand when using a limit. This is because the limit takes precedence over the flag.
-            # However, this leaves a weirdly ambiguous condition here where a limit might not be provided and
-            # parallel might be set to false.
-            # In that case, the task will be treated like any plain named task, though a warning that a ParallelTask
-            # with parallel=False should not be used over a normal NamedTask.s
-            elif task.configuration.parallel:
-                f.write(sub_item_indent + "_parallel: true\n")
-            f.write("\n")
-
-        if isinstance(task, RepeatableTask):
-            # RepeatableTask variables are almost identical to exports and thus have the same
-            # key, value write-out process.
-            f.write(sub_item_indent + "for_each>:\n")
-            for k, v in task.iterables.items():
-                # Generate a string using the values provided in order to avoid having quotes
-                # wrapping each value.
-                str_values: str = ", ".join([str(item) for item in v])
-                # Inject the values into a literal array hard coded in the string for the line.
-                f.write(sub_sub_item_indent + f"{k}: [{str_values}]\n")
-            f.write("\n")
-
-        if isinstance(task, CommandTask):
-            if image is not None and task.image is None:
-                task.image = image
-
-            # Currently fixed order in terms of which action for a command is run first. The workaround
-            # here would be to wrap each individual command in a NamedTask to guarantee the order
-            # in code.
-            if (cmd := task.get_command(exports)) is None:
-                raise ValueError("CommandTask was used but no command was provided")
-
-            f.write(sub_item_indent + f"sh>: {cmd}\n")
-            f.write("\n")
-
-        if isinstance(task, DependentWorkflow):
-            f.write(sub_item_indent + f"require>: {task.workflow}\n")
-            if task.project is not None:
-                if isinstance(task.project, str):
-                    f.write(sub_item_indent + f"project_name: {task.project}")
-                else:
-                    # task.project is an int
-                    f.write(sub_item_indent + f"project_id: {task.project}")
+                emit(sub_item_indent + f"_retry: {task.retry_condition.limit}")
+
+            emit("\n")
+
+        # Type-specific sections dispatch through a handler table keyed on the task's
+        # concrete type instead of running every isinstance check for every task. The
+        # lookup walks the MRO once per type and is cached, so subclasses still pick up
+        # every applicable section (e.g. RepeatableTask emits both the parallel and the
+        # for_each blocks, exactly as the old isinstance chain did).
+        for handler in _handlers_for(type(task)):
+            handler(self, emit, task, sub_item_indent, sub_sub_item_indent, exports, image)
+
+    def _emit_parallel(
+        self,
+        emit: Callable[[str], None],
+        task: ParallelTask,
+        sub_item_indent: str,
+        sub_sub_item_indent: str,
+        exports: dict[str, YamlSupportedType] | None,
+        image: DockerImage | None,
+    ):
+        # Parallel tasks have a short hand notation for the parallel flag when no other
+        # configuration properties are provided. Opt to just set the option to 'true' when
+        # no limit is provided.
+
+        # Additionally, the full configuration object is required to even instantiate a ParallelTask
+        # so we can first make the assumption that the intent is for the Task to run in parallel and that
+        # if a limit is not provided, then the tasks should ALL run in parallel.
+        if task.configuration.limit is not None:
+            emit(sub_item_indent + "_parallel:\n")
+            emit(sub_sub_item_indent + f"limit: {task.configuration.limit}")
+        # Although the parallel flag really should just be True, optionally, allow the value to be false
+        # as a quick shorthand when using a limit. This is because the limit takes precedence over the flag.
+        # However, this leaves a weirdly ambiguous condition here where a limit might not be provided and
+        # parallel might be set to false.
+        # In that case, the task will be treated like any plain named task, though a warning that a ParallelTask
+        # with parallel=False should not be used over a normal NamedTask.s
+        elif task.configuration.parallel:
+            emit(sub_item_indent + "_parallel: true\n")
+        emit("\n")
+
+    def _emit_repeatable(
+        self,
+        emit: Callable[[str], None],
+        task: RepeatableTask,
+        sub_item_indent: str,
+        sub_sub_item_indent: str,
+        exports: dict[str, YamlSupportedType] | None,
+        image: DockerImage | None,
+    ):
+        # RepeatableTask variables are almost identical to exports and thus have the same
+        # key, value write-out process. Each value list is injected as a literal array
+        # built without quotes around the items, and the lines are joined into a single
+        # emitted fragment.
+        emit(f"{sub_item_indent}for_each>:\n")
+        emit(
+            "".join(
+                f"{sub_sub_item_indent}{k}: [{', '.join(map(str, v))}]\n"
+                for k, v in task.iterables.items()
+            )
+        )
+        emit("\n")
 
-            f.write("\n")
+    def _emit_command(
+        self,
+        emit: Callable[[str], None],
+        task: CommandTask,
+        sub_item_indent: str,
+        sub_sub_item_indent: str,
+        exports: dict[str, YamlSupportedType] | None,
+        image: DockerImage | None,
+    ):
+        if image is not None and task.image is None:
+            task.image = image
 
-        if isinstance(task, EmbeddedTask):
-            f.write(sub_item_indent + f"call>: {task.workflow}\n")
-            f.write("\n")
+        # Currently fixed order in terms of which action for a command is run first. The workaround
+        # here would be to wrap each individual command in a NamedTask to guarantee the order
+        # in code.
+        if (cmd := task.get_command(exports)) is None:
+            raise ValueError("CommandTask was used but no command was provided")
+
+        emit(sub_item_indent + f"sh>: {cmd}\n")
+        emit("\n")
+
+    def _emit_dependent(
+        self,
+        emit: Callable[[str], None],
+        task: DependentWorkflow,
+        sub_item_indent: str,
+        sub_sub_item_indent: str,
+        exports: dict[str, YamlSupportedType] | None,
+        image: DockerImage | None,
+    ):
+        emit(sub_item_indent + f"require>: {task.workflow}\n")
+        if task.project is not None:
+            if isinstance(task.project, str):
+                emit(sub_item_indent + f"project_name: {task.project}")
+            else:
+                # task.project is an int
+                emit(sub_item_indent + f"project_id: {task.project}")
+
+        emit("\n")
+
+    def _emit_embedded(
+        self,
+        emit: Callable[[str], None],
+        task: EmbeddedTask,
+        sub_item_indent: str,
+        sub_sub_item_indent: str,
+        exports: dict[str, YamlSupportedType] | None,
+        image: DockerImage | None,
+    ):
+        emit(sub_item_indent + f"call>: {task.workflow}\n")
+        emit("\n")
 
     def _export_task(
         self,
-        f: TextIOWrapper,
+        emit: Callable[[str], None],
         workflow: Workflow,
         task: NamedTask,
         indent_level: int = 0,
         exports: dict[str, YamlSupportedType] | None = None,
         image: DockerImage | None = None,
     ):
-        if exports is None:
-            exports = {}
-
-        export_hierarchy: list[dict[str, YamlSupportedType] | None] = [
-            workflow.exports,
-            task.exports,
+        # Iterative depth-first walk over the task tree with an explicit stack instead of
+        # recursion, which drops a Python call frame per task. Each stack entry carries a
+        # ChainMap of the export scopes on its own branch, so exports are properly
+        # lexically scoped: the old recursive version updated one shared dict, which let
+        # sibling tasks see each other's exports.
+        stack: list[tuple[NamedTask, int, ChainMap]] = [
+            (
+                task,
+                indent_level,
+                ChainMap(task.exports or {}, workflow.exports or {}, exports or {}),
+            )
         ]
 
-        for eh in export_hierarchy:
-            if eh is not None:
-                exports.update(eh)
-
-        # Write the task content first before iterating on any subtasks
-        self._export_task_content(f, task, indent_level, exports, image)
-
-        # This condition is necessary to allow for any subsections, like the _do: section in
-        # a repeatable task, to be in included.
-        if len(task.tasks) > 0:
-            # Repeatable tasks nest their subtasks in a section called _do:, which means that
-            # any subtasks need to be temporarily be at another level deep for indentation.
-            if isinstance(task, RepeatableTask):
-                f.write("    " * (indent_level + 1) + "_do:\n")
-
-                # Bump the indentation for nested tasks to be within the _do:
-                indent_level = indent_level + 1
-
-            # Recursively call the export task on each subsequent task
-            for subtask in task.tasks:
-                self._export_task(
-                    f,
-                    workflow,
-                    subtask,
-                    indent_level=indent_level + 1,
-                    exports=exports,
-                    image=image,
-                )
-
-            # Undo the previous indentation change so that any subsequent tasks will be at the correct
-            # indentation level
-            if isinstance(task, RepeatableTask):
-                indent_level = indent_level - 1
+        while stack:
+            task, indent_level, chain = stack.pop()
+
+            # Write the task content first before iterating on any subtasks
+            self._export_task_content(emit, task, indent_level, dict(chain), image)
+
+            # This condition is necessary to allow for any subsections, like the _do: section in
+            # a repeatable task, to be in included.
+            if len(task.tasks) > 0:
+                # Repeatable tasks nest their subtasks in a section called _do:, which means that
+                # any subtasks need to be temporarily be at another level deep for indentation.
+                if isinstance(task, RepeatableTask):
+                    emit(self._get_indent_width(indent_level + 1) + "_do:\n")
+
+                    # Bump the indentation for nested tasks to be within the _do:
+                    indent_level = indent_level + 1
+
+                # Push subtasks in reverse so they pop back off in their defined order, each
+                # with its own export scope layered on top of this branch's chain.
+                for subtask in reversed(task.tasks):
+                    stack.append(
+                        (
+                            subtask,
+                            indent_level + 1,
+                            chain.new_child(subtask.exports or {}),
+                        )
+                    )
 
     def export(self, workflow: Workflow, image: DockerImage | None = None) -> str:
-        f = StringIO()
+        # Collect output fragments in a plain list and join once at the end. The exporter
+        # makes many tiny writes per task, and appending to a list is cheaper than going
+        # through StringIO's buffered-writer machinery for each one.
+        parts: list[str] = []
+        emit = parts.append
 
-        f.write(f"timezone: {workflow.timezone}")
-        f.write("\n" * 2)
+        emit(f"timezone: {workflow.timezone}\n\n")
         if workflow.exports is not None:
-            f.write("_export:\n")
-            for k, v in workflow.exports.items():
-                f.write("    " + f"{k}: {v}\n")
-            f.write("\n")
+            emit("_export:\n")
+            emit("".join(f"    {k}: {v}\n" for k, v in workflow.exports.items()))
+            emit("\n")
 
         if workflow.schedule is not None:
-            f.write("schedule:\n")
+            emit("schedule:\n")
             if workflow.schedule.cron is not None:
-                f.write("    " + f"cron>: {workflow.schedule.cron.to_string()} \n")
+                emit(f"    cron>: {workflow.schedule.cron.to_string()} \n")
             elif workflow.schedule.daily is not None:
-                f.write("    " + f"daily>: {workflow.schedule.daily} \n")
+                emit(f"    daily>: {workflow.schedule.daily} \n")
             if (
                 workflow.schedule.skip_delayed_by is not None
                 and workflow.schedule.skip_delayed_by > 0
             ):
-                f.write(
-                    "    " + f"skip_delayed_by: {workflow.schedule.skip_delayed_by}s\n"
-                )
-            f.write(
-                "    "
-                + f"skip_on_overtime: {str(workflow.schedule.skip_on_overtime).lower()}\n"
+                emit(f"    skip_delayed_by: {workflow.schedule.skip_delayed_by}s\n")
+            emit(
+                f"    skip_on_overtime: {str(workflow.schedule.skip_on_overtime).lower()}\n"
             )
-            f.write("\n")
+            emit("\n")
 
         for task in workflow.tasks:
             self._export_task(
-                f,
+                emit,
                 workflow,
                 task,
                 exports=workflow.exports,
@@ -224,33 +297,142 @@ class WorkflowExporter:
         if workflow.error is not None:
             workflow.error.name = "_error"
             self._export_task(
-                f,
+                emit,
                 workflow,
                 workflow.error,
                 exports=workflow.exports,
                 image=image,
             )
 
-        f.seek(0)
-        return f.getvalue()
+        return "".join(parts)
+
+
+# Registry of the type-specific emitters above. Lookups resolve through _handlers_for,
+# which walks a type's MRO base-first so subclasses inherit every applicable section.
+_TASK_HANDLERS: dict[type, Callable] = {
+    ParallelTask: WorkflowExporter._emit_parallel,
+    RepeatableTask: WorkflowExporter._emit_repeatable,
+    CommandTask: WorkflowExporter._emit_command,
+    DependentWorkflow: WorkflowExporter._emit_dependent,
+    EmbeddedTask: WorkflowExporter._emit_embedded,
+}
+
+_HANDLER_CACHE: dict[type, tuple[Callable, ...]] = {}
+
+
+def _handlers_for(task_type: type) -> tuple[Callable, ...]:
+    handlers = _HANDLER_CACHE.get(task_type)
+    if handlers is None:
+        # Reversed MRO puts base classes first, matching the order of the isinstance
+        # chain this dispatch replaced.
+        handlers = tuple(
+            _TASK_HANDLERS[klass]
+            for klass in reversed(task_type.__mro__)
+            if klass in _TASK_HANDLERS
+        )
+        _HANDLER_CACHE[task_type] = handlers
+    return handlers
 
 
 class ProjectExporter:
-    def _create_dig_archive(self, project: pathlib.Path) -> bytes:
-        with tempfile.TemporaryFile() as temp:
-            with tarfile.open(
-                mode="w:gz", fileobj=temp, compresslevel=6, format=tarfile.GNU_FORMAT
-            ) as tar:
-                # for dig_file in project.rglob("**/*.dig"):
-                for dig_file in project.iterdir():
-                    tar.add(dig_file, arcname=dig_file.name)
-
-            # Seek back to the start of the file since we are not closing and re-opening it
-            temp.seek(0)
-            content = temp.read()
-        return content
+    # Archives up to this size are kept fully in memory; anything bigger spills to disk.
+    _SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+    def __init__(
+        self,
+        compresslevel: int = 3,
+    ) -> None:
+        # Project archives are mostly small text .dig files, where the higher deflate
+        # levels cost a lot of CPU for very little extra ratio. Level 3 is the better
+        # speed/size tradeoff for the upload path, but callers that care more about
+        # archive size can dial it back up.
+        self.compresslevel = compresslevel
+
+    def _create_dig_archive(
+        self,
+        entries: Iterable[tuple[str, pathlib.Path | bytes]],
+        ignore_patterns: tuple[str, ...] = (),
+    ) -> IO[bytes]:
+        # The archive is built into a spooled temp file and handed back as an open
+        # file object (seeked to the start) so that callers can stream it out in chunks
+        # instead of holding the entire tarball in memory as one bytes object.
+        #
+        # Each entry is either raw bytes (generated .dig content added straight from
+        # memory) or a path that is tarred directly from its source location, so nothing
+        # gets staged through an intermediate directory first.
+        def _ignore_filter(info: tarfile.TarInfo) -> tarfile.TarInfo | None:
+            basename = pathlib.PurePath(info.name).name
+            for pattern in ignore_patterns:
+                if fnmatch.fnmatch(basename, pattern):
+                    return None
+            return info
+
+        temp = tempfile.SpooledTemporaryFile(max_size=self._SPOOL_MAX_SIZE)
+
+        if igzip is not None:
+            # ISA-L caps its compression levels at 3, which lines up with the default here.
+            gz: IO[bytes] = igzip.IGzipFile(
+                fileobj=temp,
+                mode="wb",
+                compresslevel=min(self.compresslevel, 3),
+            )
+        else:
+            gz = gzip.GzipFile(
+                fileobj=temp,
+                mode="wb",
+                compresslevel=self.compresslevel,
+            )
+
+        # The tar stream is layered over the gzip file object explicitly in both branches
+        # so the stream ("|") mode applies either way; tarfile only honors bufsize for
+        # stream modes, so the "w:gz" shortcut would quietly fall back to the 10 KiB
+        # default blocking.
+        tar = tarfile.open(
+            mode="w|",
+            fileobj=gz,
+            format=tarfile.GNU_FORMAT,
+            bufsize=65536,
+        )
+
+        try:
+            now = int(time.time())
+            for arcname, source in entries:
+                if isinstance(source, bytes):
+                    # Generated content never touches the filesystem, so the header
+                    # metadata is filled in by hand instead of tarfile stat-ing a file.
+                    info = tarfile.TarInfo(name=arcname)
+                    info.size = len(source)
+                    info.mtime = now
+                    info.mode = 0o644
+                    tar.addfile(info, io.BytesIO(source))
+                else:
+                    tar.add(source, arcname=arcname, filter=_ignore_filter)
+        finally:
+            tar.close()
+            gz.close()
+
+        # Seek back to the start of the file since we are not closing and re-opening it
+        temp.seek(0)
+        return temp
 
     def export(self, project: WorkflowProject) -> bytes:
+        """
+        Export the project archive fully into memory as bytes.
+        """
+        stream = self.export_stream(project)
+        try:
+            return stream.read()
+        finally:
+            stream.close()
+
+    def export_stream(self, project: WorkflowProject) -> IO[bytes]:
+        """
+        Export the project archive as an open binary file object positioned at the start.
+
+        Small archives stay in memory while large ones spill to a temp file, so uploads
+        can stream the content in chunks rather than buffering the whole tarball. The
+        caller is responsible for closing the returned file object.
+        """
         if project.image is not None:
             project.add_workflow(
                 Workflow(
@@ -266,28 +448,26 @@ class ProjectExporter:
 
         exporter = WorkflowExporter()
 
-        with tempfile.TemporaryDirectory() as tmp:
-            dir_path = pathlib.Path(tmp)
-
-            # Generate workflow files in the root directory of the temp dir
-            for workflow in project.workflows:
-                workflow_path = dir_path / (workflow.name + ".dig")
-
-                wf_content = exporter.export(workflow, project.image)
-                with workflow_path.open("w") as f:
-                    f.write(wf_content)
-
-            # Copy overy the entire project contents if a project root folder parent folder is
-            # provided. Using this will allow all of the files to be contained within the workflow
-            # revision.
-            if project.project_root is not None:
-                shutil.copytree(
-                    project.project_root.root_path,
-                    dir_path,
-                    ignore=shutil.ignore_patterns(
-                        "__pycache__", ".git", *project.project_root.ignore_patterns
-                    ),
-                    dirs_exist_ok=True,
-                )
-            content = self._create_dig_archive(dir_path)
-        return content
+        # Generated workflow content goes into the archive straight from memory, and the
+        # project root (when provided) is tarred directly from its source location. This
+        # skips the old copytree staging step, which read and wrote every project file
+        # twice. Project-root entries come last so that a file sharing a generated
+        # workflow's name still wins, matching the previous copytree overwrite behavior.
+        entries: list[tuple[str, pathlib.Path | bytes]] = [
+            (workflow.name + ".dig", exporter.export(workflow, project.image).encode())
+            for workflow in project.workflows
+        ]
+
+        ignore_patterns: tuple[str, ...] = ()
+        if project.project_root is not None:
+            ignore_patterns = (
+                "__pycache__",
+                ".git",
+                *project.project_root.ignore_patterns,
+            )
+            entries.extend(
+                (item.name, item)
+                for item in project.project_root.root_path.iterdir()
+            )
+
+        return self._create_dig_archive(entries, ignore_patterns)
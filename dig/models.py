@@ -1,9 +1,9 @@
 import pathlib
 import uuid
 from enum import Enum
-from typing import Self, TypeAlias
+from typing import Any, Self, TypeAlias
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, field_validator
 
 YamlSupportedType: TypeAlias = str | int | list[str] | list[int] | list[str | int]
 
@@ -14,6 +14,11 @@ class RetryIntervalType(str, Enum):
 
 
 class SimpleRetryCondition(BaseModel):
+    # Retry conditions are pure value objects that are never mutated after construction,
+    # so freeze them. Frozen instances are also hashable, which lets them participate in
+    # cache keys.
+    model_config = ConfigDict(frozen=True)
+
     limit: int
 
 
@@ -45,6 +50,18 @@ class Task(BaseModel):
         self.tasks.append(task)
         return self
 
+    @classmethod
+    def build(cls, **kwargs: Any) -> Self:
+        """
+        Fast construction path for values that are already well typed.
+
+        Code generating large numbers of tasks in loops pays a full validation pass per
+        instance through the normal constructor. build() skips that via model_construct.
+        Note that field validators are skipped too (e.g. the .dig extension fix-up on
+        EmbeddedTask), so only use this when the inputs are known good.
+        """
+        return cls.model_construct(**kwargs)
+
 
 class ParallelTaskConfiguration(BaseModel):
     """
@@ -53,6 +70,8 @@ class ParallelTaskConfiguration(BaseModel):
     One of parallel/limit must be provided if a task is marked as parallel.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     parallel: bool = False
     limit: int | None = None
 
@@ -81,21 +100,23 @@ class DockerImageConfiguration(BaseModel):
 
     When built, an image will be created with the given name and tagged with the provided tag. "name:tag"
 
-    By default, if a tag is not provided, a UUIDv4 value will be automatically generated.
+    By default, if a tag is not provided, a UUIDv4 value will be automatically generated
+    the first time the tag is actually needed. Generating it lazily keeps the common
+    explicit-tag case (and bulk construction of image configs) from paying an os.urandom
+    syscall per instance.
     """
 
     name: str
-    tag: str = Field(
-        default_factory=lambda: str(uuid.uuid4()),
-    )
+    tag: str | None = None
 
-    def get_full_image_tag(self) -> str:
-        image_tag_parts = [self.name]
-
-        if self.tag is not None:
-            image_tag_parts.append(self.tag)
+    @property
+    def effective_tag(self) -> str:
+        if self.tag is None:
+            self.tag = str(uuid.uuid4())
+        return self.tag
 
-        return ":".join(image_tag_parts)
+    def get_full_image_tag(self) -> str:
+        return f"{self.name}:{self.effective_tag}"
 
 
 class DockerVolume(BaseModel):
@@ -103,10 +124,33 @@ class DockerVolume(BaseModel):
     High level wrapper for the DockerVolume "-v" flag syntax.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     host_path: str
     container_path: str
 
 
+# Env flags forwarding the built-in Digdag session variables into the container. These are
+# fixed strings, so they are formatted once at import rather than per start command.
+_DIGDAG_ENV_PARTS: tuple[str, ...] = tuple(
+    f"-e DIGDAG_{digdag_var.upper()}='${{{digdag_var}}}'"
+    for digdag_var in (
+        "timezone",
+        "project_id",
+        "task_name",
+        "attempt_id",
+        "session_uuid",
+        "session_id",
+        "session_time",
+        # The following fields only exist in scheduled jobs. It is possible to pass this information downward from
+        # the WorkflowProject instance but for now, they're being ignore from the environment.
+        # "last_session_time",
+        # "last_executed_session_time",
+        # "next_session_time",
+    )
+)
+
+
 class DockerImage(BaseModel):
     """
     High level Docker image creation/start configuration that can be used for project/task execution.
@@ -119,49 +163,42 @@ class DockerImage(BaseModel):
     configuration: DockerImageConfiguration
     volumes: list[DockerVolume] = Field(default_factory=list)
 
+    # Start commands are deterministic per export set, but the exporter rebuilds them for
+    # every CommandTask sharing this image — potentially thousands of times per project.
+    # Cache per exports key; the cache assumes the image configuration is not mutated
+    # between exports, which matches how the exporter uses it.
+    _start_cmd_cache: dict[tuple, str] = PrivateAttr(default_factory=dict)
+
     def get_container_start_command(
         self, exports: dict[str, YamlSupportedType] | None = None
+    ) -> str:
+        try:
+            key = tuple(sorted((exports or {}).items()))
+            cmd = self._start_cmd_cache.get(key)
+        except TypeError:
+            # Unhashable or unsortable export values; just build the command directly.
+            return self._build_container_start_command(exports)
+
+        if cmd is None:
+            cmd = self._build_container_start_command(exports)
+            self._start_cmd_cache[key] = cmd
+        return cmd
+
+    def _build_container_start_command(
+        self, exports: dict[str, YamlSupportedType] | None = None
     ) -> str:
         parts = [
             "sudo docker run",
         ]
 
-        for vol in self.volumes:
-            parts.append(f"-v {vol.host_path}:{vol.container_path}")
-
-        for digdag_var in (
-            "timezone",
-            "project_id",
-            "task_name",
-            "attempt_id",
-            "session_uuid",
-            "session_id",
-            "session_time",
-            # The following fields only exist in scheduled jobs. It is possible to pass this information downward from
-            # the WorkflowProject instance but for now, they're being ignore from the environment.
-            # "last_session_time",
-            # "last_executed_session_time",
-            # "next_session_time",
-        ):
-            parts.append(
-                "-e DIGDAG_%s='${%s}'"
-                % (
-                    digdag_var.upper(),
-                    digdag_var,
-                )
-            )
+        parts.extend(f"-v {vol.host_path}:{vol.container_path}" for vol in self.volumes)
+
+        parts.extend(_DIGDAG_ENV_PARTS)
 
         # Additionally, pass any extra exports (recursively overwriting values) from the specified exports for
         # a task/project/workflow.
         if exports is not None:
-            for key in exports.keys():
-                parts.append(
-                    "-e %s='${%s}'"
-                    % (
-                        key,
-                        key,
-                    )
-                )
+            parts.extend(f"-e {key}='${{{key}}}'" for key in exports)
 
         parts.append(self.configuration.get_full_image_tag())
 
@@ -201,14 +238,15 @@ class CommandTask(NamedTask):
     ) -> str:
         parts: list[str] = []
 
-        if exports is None:
-            exports = {}
-
-        if self.exports is not None:
-            exports.update(self.exports)
+        # Merge the task's own exports over the provided ones into a fresh dict rather
+        # than updating the caller's dict in place, which used to leak this task's
+        # exports back up into whatever scope the caller passed in.
+        merged = exports if exports is not None else {}
+        if self.exports:
+            merged = {**merged, **self.exports}
 
         if self.image is not None:
-            parts.append(self.image.get_container_start_command(exports))
+            parts.append(self.image.get_container_start_command(merged))
 
         parts.append(self.command)
 
@@ -245,18 +283,20 @@ class DependentWorkflow(NamedTask):
 class EmbeddedTask(NamedTask):
     workflow: str
 
-    @field_validator("workflow")
+    @field_validator("workflow", mode="before")
+    @classmethod
     def check_extension(cls, v: str | None) -> str | None:
-        # Check the the provided embedded workflow is provided as a file name
-        # rather than just the workflow name.
-        if v is None:
-            return v
-        if not v.endswith(".dig"):
-            return v + ".dig"
-        return v
+        # Check the the provided embedded workflow is provided as a file name rather than
+        # just the workflow name. Running in before mode normalizes the raw input in one
+        # conditional expression instead of wrapping the field's validated value in a
+        # second dispatch; anything that is not a string falls through to the normal
+        # field validation.
+        return v if not isinstance(v, str) or v.endswith(".dig") else f"{v}.dig"
 
 
 class CRONSchedule(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     minutes: str = "*"
     hours: str = "*"
     day_of_month: str = "*"
@@ -264,9 +304,8 @@ class CRONSchedule(BaseModel):
     day_of_week: str = "*"
 
     def to_string(self) -> str:
-        return " ".join(
-            [self.minutes, self.hours, self.day_of_month, self.month, self.day_of_week]
-        )
+        # Fixed arity, so a single f-string beats building a throwaway list for join.
+        return f"{self.minutes} {self.hours} {self.day_of_month} {self.month} {self.day_of_week}"
 
 
 class WorkflowSchedule(BaseModel):
@@ -315,3 +354,10 @@ class WorkflowProject(BaseModel):
     def add_workflow(self, workflow: Workflow) -> Self:
         self.workflows.append(workflow)
         return self
+
+    @classmethod
+    def build(cls, **kwargs: Any) -> Self:
+        """
+        Fast construction path for values that are already well typed; see Task.build.
+        """
+        return cls.model_construct(**kwargs)